@@ -8,40 +8,59 @@ Public API:
     run(config_path: str = "config.txt") -> None
 """
 from __future__ import annotations
+import copy
 import json
-from dataclasses import dataclass
+import os
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
 from typing import List, Tuple, Optional, Dict
+import numpy as np
 import pygame
 
+try:
+    import orjson  # optional, faster config parsing
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit  # optional, compiles the port scan
+except ImportError:
+    njit = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+_DEFAULTS: Dict = {
+    "WIDTH": 1280,
+    "HEIGHT": 720,
+    "FPS": 90,
+    "GRID": 16,
+    "SNAP_RADIUS": 14,
+    "PORT_RADIUS": 6,
+    "SIGNAL_FAMILIES": {
+        "red": {"on": [230, 70, 70], "off": [110, 35, 35]},
+        "green": {"on": [70, 210, 120], "off": [30, 80, 55]},
+        "blue": {"on": [100, 160, 250], "off": [40, 65, 95]},
+        "purple": {"on": [170, 100, 220], "off": [70, 45, 95]},
+        "amber": {"on": [255, 200, 80], "off": [120, 90, 40]},
+    },
+    "DEFAULT_FAMILY": "red",
+    "COLORS": {
+        "BLACK": [15, 17, 20],
+        "PANEL_BG": [30, 34, 40],
+        "PANEL_BORDER": [60, 68, 80],
+        "WHITE": [230, 235, 240],
+        "MUTED": [150, 156, 165],
+        "SELECT": [255, 204, 102],
+    },
+}
+
 
 def _load_config(path: str) -> Dict:
-    defaults = {
-        "WIDTH": 1280,
-        "HEIGHT": 720,
-        "FPS": 90,
-        "GRID": 16,
-        "SNAP_RADIUS": 14,
-        "PORT_RADIUS": 6,
-        "SIGNAL_FAMILIES": {
-            "red": {"on": [230, 70, 70], "off": [110, 35, 35]},
-            "green": {"on": [70, 210, 120], "off": [30, 80, 55]},
-            "blue": {"on": [100, 160, 250], "off": [40, 65, 95]},
-            "purple": {"on": [170, 100, 220], "off": [70, 45, 95]},
-            "amber": {"on": [255, 200, 80], "off": [120, 90, 40]},
-        },
-        "DEFAULT_FAMILY": "red",
-        "COLORS": {
-            "BLACK": [15, 17, 20],
-            "PANEL_BG": [30, 34, 40],
-            "PANEL_BORDER": [60, 68, 80],
-            "WHITE": [230, 235, 240],
-            "MUTED": [150, 156, 165],
-            "SELECT": [255, 204, 102],
-        },
-    }
+    defaults = copy.deepcopy(_DEFAULTS)
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            user = json.load(f)
+        with open(path, "rb") as f:
+            user = _json_loads(f.read())
         # shallow merge (sufficient here)
         for k, v in user.items():
             if isinstance(v, dict) and k in defaults:
@@ -57,9 +76,72 @@ def _snap(v: int, g: int) -> int:
     return g * round(v / g)
 
 
+def _nearest_port_np(xy, dirs, mx, my, r2, want):
+    """Index of the closest port within sqrt(r2) matching direction code want (-1 = any), or -1."""
+    dx = xy[:, 0] - mx
+    dy = xy[:, 1] - my
+    d2 = dx * dx + dy * dy
+    if want >= 0:
+        d2 = np.where(dirs == want, d2, np.iinfo(np.int32).max)
+    # last match wins on ties (top-most block), like the original scan
+    i = len(d2) - 1 - int(d2[::-1].argmin())
+    return i if d2[i] <= r2 else -1
+
+
+def _nearest_port_loop(xy, dirs, mx, my, r2, want):
+    # same contract as _nearest_port_np, written as a plain loop for numba
+    best = -1
+    best_d2 = r2
+    for i in range(xy.shape[0]):
+        if want >= 0 and dirs[i] != want:
+            continue
+        dx = xy[i, 0] - mx
+        dy = xy[i, 1] - my
+        d2 = dx * dx + dy * dy
+        if d2 <= best_d2:
+            best = i
+            best_d2 = d2
+    return best
+
+
+_nearest_port = njit(cache=True)(_nearest_port_loop) if njit is not None else _nearest_port_np
+
+
+_FONT_NAME = "SF Mono, Menlo, Consolas, monospace"
+_FONT_CACHE: Dict[int, pygame.font.Font] = {}
+_TEXT_CACHE: "OrderedDict[Tuple[str, int, Tuple[int, ...]], pygame.Surface]" = OrderedDict()
+_TEXT_CACHE_MAX = 512
+
+
+def _get_font(size: int) -> pygame.font.Font:
+    # SysFont resolves/loads font files on every call; keep one Font per size
+    font = _FONT_CACHE.get(size)
+    if font is None:
+        font = _FONT_CACHE[size] = pygame.font.SysFont(_FONT_NAME, size)
+    return font
+
+
+def _clear_font_caches():
+    # Font objects die with the font module; drop them before pygame.quit()
+    _TEXT_CACHE.clear()
+    _FONT_CACHE.clear()
+
+
+def _render_text(text: str, size: int, color) -> pygame.Surface:
+    # labels are a small fixed set, so keep rendered surfaces (LRU-bounded)
+    key = (text, size, tuple(color))
+    s = _TEXT_CACHE.get(key)
+    if s is None:
+        s = _TEXT_CACHE[key] = _get_font(size).render(text, True, color)
+        if len(_TEXT_CACHE) > _TEXT_CACHE_MAX:
+            _TEXT_CACHE.popitem(last=False)
+    else:
+        _TEXT_CACHE.move_to_end(key)
+    return s
+
+
 def _draw_text(surface, text, pos, size=16, color=(255, 255, 255), center=False):
-    font = pygame.font.SysFont("SF Mono, Menlo, Consolas, monospace", size)
-    s = font.render(text, True, color)
+    s = _render_text(text, size, color)
     r = s.get_rect()
     if center:
         r.center = pos
@@ -68,30 +150,42 @@ def _draw_text(surface, text, pos, size=16, color=(255, 255, 255), center=False)
     surface.blit(s, r)
 
 
-@dataclass
+@dataclass(slots=True)
 class Port:
     owner: "Block"
     name: str
     direction: str  # "in" | "out"
     offset: Tuple[int, int]
     family: str
-    state: bool = False
+    _idx: int = field(default=-1, repr=False, compare=False)  # row in World's port arrays
+    _world: Tuple[int, int] = field(default=(0, 0), repr=False, compare=False)  # refreshed by the owner block
+
+    @property
+    def state(self) -> bool:
+        # canonical signal state lives in World._port_state; removed ports have _idx -1
+        return self._idx >= 0 and bool(self.owner.world_ref._port_state[self._idx])
+
+    @state.setter
+    def state(self, value: bool):
+        if self._idx >= 0:
+            self.owner.world_ref._port_state[self._idx] = value
 
     def world(self) -> Tuple[int, int]:
-        bx, by = self.owner.pos
-        ox, oy = self.offset
-        return (bx + ox, by + oy)
+        return self._world
 
     def color(self, fam_palette: Dict[str, Dict[str, Tuple[int, int, int]]]):
         pal = fam_palette.get(self.family, fam_palette[self.owner.world_ref.DEFAULT_FAMILY])
         return pal["on"] if self.state else pal["off"]
 
     def hit(self, mx, my, port_radius: int) -> bool:
-        x, y = self.world()
-        return (mx - x) ** 2 + (my - y) ** 2 <= (port_radius + 3) ** 2
+        x, y = self._world
+        dx = mx - x
+        dy = my - y
+        r = port_radius + 3
+        return dx * dx + dy * dy <= r * r
 
 
-@dataclass
+@dataclass(slots=True, eq=False)  # identity equality: list.remove() must only match the same wire
 class Wire:
     src: Port
     dst: Port
@@ -100,18 +194,16 @@ class Wire:
         pal = fam_palette.get(self.src.family, fam_palette[default_family])
         return pal["on"] if self.src.state else pal["off"]
 
-    def draw(self, surface, fam_palette, default_family, port_radius: int):
-        sx, sy = self.src.world()
-        dx, dy = self.dst.world()
+    def points(self) -> List[Tuple[int, int]]:
+        sx, sy = self.src._world
+        dx, dy = self.dst._world
         midx = (sx + dx) // 2
-        points = [(sx, sy), (midx, sy), (midx, dy), (dx, dy)]
-        col = self.color(fam_palette, default_family)
-        pygame.draw.lines(surface, col, False, points, 4)
-        pygame.draw.circle(surface, col, (sx, sy), max(2, port_radius // 2))
-        pygame.draw.circle(surface, col, (dx, dy), max(2, port_radius // 2))
+        return [(sx, sy), (midx, sy), (midx, dy), (dx, dy)]
 
 
 class Block:
+    select_radius = 12
+
     def __init__(self, world_ref: "World", pos: Tuple[int, int]):
         self.world_ref = world_ref
         self.pos = [_snap(pos[0], world_ref.GRID), _snap(pos[1], world_ref.GRID)]
@@ -120,26 +212,62 @@ class Block:
         self.ports: List[Port] = []
         self.selected: bool = False
         self.family = world_ref.DEFAULT_FAMILY
+        # built lazily: subclasses set w/h after this __init__ returns
+        self._rect: Optional[pygame.Rect] = None
+        # pre-rendered body, rebuilt when _body_key() changes
+        self._body_surf: Optional[pygame.Surface] = None
+        self._body_cache_key = None
 
     def rect(self) -> pygame.Rect:
-        x, y = self.pos
-        return pygame.Rect(x - self.w // 2, y - self.h // 2, self.w, self.h)
+        """Cached bounding rect; callers must not mutate it."""
+        if self._rect is None:
+            x, y = self.pos
+            self._rect = pygame.Rect(x - self.w // 2, y - self.h // 2, self.w, self.h)
+        return self._rect
+
+    def _body_key(self):
+        # everything the body's look depends on besides size
+        return self.title
+
+    def _label(self) -> str:
+        return self.title
+
+    def _paint_body(self, surf, r):
+        pygame.draw.rect(surf, (52, 84, 110), r, border_radius=10)
+        pygame.draw.rect(surf, (20, 25, 30), r, 2, border_radius=10)
+        _draw_text(surf, self._label(), (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
+
+    def _body(self) -> pygame.Surface:
+        key = (self.w, self.h, self._body_key())
+        if self._body_surf is None or key != self._body_cache_key:
+            # labels may run past the block edge, so grow the surface to fit them
+            tw, th = _get_font(14).size(self._label())
+            surf = pygame.Surface((max(self.w, tw + 8), max(self.h, th + 6)), pygame.SRCALPHA)
+            self._paint_body(surf, pygame.Rect(0, 0, self.w, self.h))
+            self._body_surf = surf.convert_alpha()
+            self._body_cache_key = key
+        return self._body_surf
 
     def draw(self, surface):
         r = self.rect()
-        pygame.draw.rect(surface, (52, 84, 110), r, border_radius=10)
-        pygame.draw.rect(surface, (20, 25, 30), r, 2, border_radius=10)
-        _draw_text(surface, self.title, (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
+        surface.blit(self._body(), r)
         if self.selected:
-            pygame.draw.rect(surface, self.world_ref.SELECT, r.inflate(6, 6), 2, border_radius=12)
-        # ports
-        for p in self.ports:
-            wx, wy = p.world()
-            pygame.draw.circle(surface, (0, 0, 0), (wx, wy), self.world_ref.PORT_RADIUS + 2)
-            pygame.draw.circle(surface, p.color(self.world_ref.SIGNAL_FAMILIES), (wx, wy), self.world_ref.PORT_RADIUS)
+            pygame.draw.rect(surface, self.world_ref.SELECT, r.inflate(6, 6), 2, border_radius=self.select_radius)
+        # ports are drawn in one batch by World._draw_all_ports
 
     def move_to(self, x, y):
         self.pos[0], self.pos[1] = _snap(x, self.world_ref.GRID), _snap(y, self.world_ref.GRID)
+        if self._rect is not None:
+            self._rect.topleft = (self.pos[0] - self.w // 2, self.pos[1] - self.h // 2)
+        self._refresh_port_cache()
+        self.world_ref._index_block(self)
+        self.world_ref._sync_ports(self)
+
+    def _refresh_port_cache(self):
+        bx, by = self.pos
+        for p in self.ports:
+            ox, oy = p.offset
+            p._world = (bx + ox, by + oy)
 
     def hit(self, mx, my) -> bool:
         return self.rect().collidepoint(mx, my)
@@ -153,7 +281,9 @@ class Block:
     def add_port(self, name, direction, offset, family=None) -> Port:
         fam = family or self.family
         p = Port(self, name, direction, offset, fam)
+        p._world = (self.pos[0] + offset[0], self.pos[1] + offset[1])
         self.ports.append(p)
+        self.world_ref._register_port(p)
         return p
 
 
@@ -168,47 +298,48 @@ class InputBlock(Block):
     def toggle(self):
         self.state = not self.state
         self.out.state = self.state
+        self.world_ref.mark_dirty()
 
-    def draw(self, surface):
-        r = self.rect()
+    def _body_key(self):
+        return self.state
+
+    def _paint_body(self, surf, r):
         bg = (60, 30, 30) if self.state else (35, 20, 20)
-        pygame.draw.rect(surface, bg, r, border_radius=10)
-        pygame.draw.rect(surface, (20, 25, 30), r, 2, border_radius=10)
-        _draw_text(surface, f"INPUT: {'ON' if self.state else 'OFF'}", (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
-        if self.selected:
-            pygame.draw.rect(surface, self.world_ref.SELECT, r.inflate(6, 6), 2, border_radius=12)
-        for p in self.ports:
-            wx, wy = p.world()
-            pygame.draw.circle(surface, (0, 0, 0), (wx, wy), self.world_ref.PORT_RADIUS + 2)
-            pygame.draw.circle(surface, p.color(self.world_ref.SIGNAL_FAMILIES), (wx, wy), self.world_ref.PORT_RADIUS)
+        pygame.draw.rect(surf, bg, r, border_radius=10)
+        pygame.draw.rect(surf, (20, 25, 30), r, 2, border_radius=10)
+        _draw_text(surf, self._label(), (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
+
+    def _label(self) -> str:
+        return f"INPUT: {'ON' if self.state else 'OFF'}"
 
     def on_click(self):
         self.toggle()
 
 
 class LampBlock(Block):
+    select_radius = 14
+
     def __init__(self, world_ref: "World", pos):
         super().__init__(world_ref, pos)
         self.title = "LAMP"
         self.w, self.h = 64, 64
         self.inp = self.add_port("in", "in", (-self.w // 2, 0), family="red")
 
-    def draw(self, surface):
-        r = self.rect()
-        pygame.draw.rect(surface, (30, 30, 30), r, border_radius=12)
-        pygame.draw.rect(surface, (20, 25, 30), r, 2, border_radius=12)
+    def _body_key(self):
+        return self.inp.state
+
+    def _paint_body(self, surf, r):
+        pygame.draw.rect(surf, (30, 30, 30), r, border_radius=12)
+        pygame.draw.rect(surf, (20, 25, 30), r, 2, border_radius=12)
         cx, cy = r.center
         on = self.inp.state
         pal = self.world_ref.SIGNAL_FAMILIES[self.inp.family]
         col = pal["on" if on else "off"]
-        pygame.draw.circle(surface, col, (cx, cy + 6), 16)
-        _draw_text(surface, "LAMP", (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
-        if self.selected:
-            pygame.draw.rect(surface, self.world_ref.SELECT, r.inflate(6, 6), 2, border_radius=14)
-        for p in self.ports:
-            wx, wy = p.world()
-            pygame.draw.circle(surface, (0, 0, 0), (wx, wy), self.world_ref.PORT_RADIUS + 2)
-            pygame.draw.circle(surface, p.color(self.world_ref.SIGNAL_FAMILIES), (wx, wy), self.world_ref.PORT_RADIUS)
+        pygame.draw.circle(surf, col, (cx, cy + 6), 16)
+        _draw_text(surf, self._label(), (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
+
+    def _label(self) -> str:
+        return "LAMP"
 
 
 class OutputBlock(Block):
@@ -221,22 +352,21 @@ class OutputBlock(Block):
         self.w, self.h = 84, 50
         self.inp = self.add_port("in", "in", (-self.w // 2, 0), family="amber")
 
-    def draw(self, surface):
-        r = self.rect()
+    def _body_key(self):
+        return self.inp.state
+
+    def _paint_body(self, surf, r):
         pal = self.world_ref.SIGNAL_FAMILIES[self.inp.family]
         col = pal["on" if self.inp.state else "off"]
-        pygame.draw.rect(surface, (34, 34, 24), r, border_radius=10)
-        pygame.draw.rect(surface, (20, 25, 30), r, 2, border_radius=10)
-        _draw_text(surface, f"OUTPUT: {'ON' if self.inp.state else 'OFF'}", (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
+        pygame.draw.rect(surf, (34, 34, 24), r, border_radius=10)
+        pygame.draw.rect(surf, (20, 25, 30), r, 2, border_radius=10)
+        _draw_text(surf, self._label(), (r.x + 8, r.y + 6), 14, self.world_ref.WHITE)
         # indicator bar on right
         bar = pygame.Rect(r.right - 18, r.y + 10, 10, r.height - 20)
-        pygame.draw.rect(surface, col, bar, border_radius=4)
-        if self.selected:
-            pygame.draw.rect(surface, self.world_ref.SELECT, r.inflate(6, 6), 2, border_radius=12)
-        for p in self.ports:
-            wx, wy = p.world()
-            pygame.draw.circle(surface, (0, 0, 0), (wx, wy), self.world_ref.PORT_RADIUS + 2)
-            pygame.draw.circle(surface, p.color(self.world_ref.SIGNAL_FAMILIES), (wx, wy), self.world_ref.PORT_RADIUS)
+        pygame.draw.rect(surf, col, bar, border_radius=4)
+
+    def _label(self) -> str:
+        return f"OUTPUT: {'ON' if self.inp.state else 'OFF'}"
 
 
 class AndBlock(Block):
@@ -273,7 +403,7 @@ class NotBlock(Block):
 
 
 
-@dataclass
+@dataclass(slots=True)
 class Button:
     label: str
     rect: pygame.Rect
@@ -288,11 +418,18 @@ class Button:
 
 
 class Toolbar:
+    # buttons sit in one row at a fixed stride, so hit tests are arithmetic
+    BUTTON_X0 = 12
+    BUTTON_Y0 = 12
+    BUTTON_W, BUTTON_H = 120, 60
+    BUTTON_STRIDE = 130
+
     def __init__(self, world_ref: "World"):
         self.world_ref = world_ref
         self.rect = pygame.Rect(0, world_ref.HEIGHT - 84, world_ref.WIDTH, 84)
         self.buttons: List[Button] = []
         self.active_payload: Optional[Dict] = None
+        self._hovered: Optional[int] = None  # button index under the mouse, set on motion
         self._layout()
 
     def _layout(self):
@@ -305,29 +442,44 @@ class Toolbar:
             ("OR", {"tool": "place", "type": "or", "n": 2}),
             ("NOT", {"tool": "place", "type": "not"}),
         ]
-        x = 12
+        x = self.BUTTON_X0
         for text, payload in labels:
-            r = pygame.Rect(x, self.rect.y + 12, 120, 60)
+            r = pygame.Rect(x, self.rect.y + self.BUTTON_Y0, self.BUTTON_W, self.BUTTON_H)
             self.buttons.append(Button(text, r, payload))
-            x += 130
+            x += self.BUTTON_STRIDE
 
     def draw(self, surface):
         colors = self.world_ref.COLORS
         pygame.draw.rect(surface, colors["PANEL_BG"], self.rect)
         pygame.draw.line(surface, colors["PANEL_BORDER"], (0, self.rect.y), (self.rect.right, self.rect.y), 2)
-        mx, my = pygame.mouse.get_pos()
-        for b in self.buttons:
-            b.draw(surface, colors, b.rect.collidepoint(mx, my))
+        for i, b in enumerate(self.buttons):
+            b.draw(surface, colors, i == self._hovered)
         if self.active_payload:
             label = self.active_payload.get("type", self.active_payload.get("tool", ""))
             _draw_text(surface, f"Active: {label}", (self.rect.right - 200, self.rect.y + 8), 14, self.world_ref.COLORS["MUTED"])
 
+    def _button_at(self, pos) -> Optional[int]:
+        lx = pos[0] - self.BUTTON_X0
+        ly = pos[1] - (self.rect.y + self.BUTTON_Y0)
+        if lx < 0 or not 0 <= ly < self.BUTTON_H or lx % self.BUTTON_STRIDE >= self.BUTTON_W:
+            return None
+        i = lx // self.BUTTON_STRIDE
+        return i if i < len(self.buttons) else None
+
+    def update_hover(self, pos) -> bool:
+        """Recomputes the hovered button; returns True if it changed."""
+        hovered = self._button_at(pos)
+        changed = hovered != self._hovered
+        self._hovered = hovered
+        return changed
+
     def handle_click(self, pos):
-        for b in self.buttons:
-            if b.rect.collidepoint(*pos):
-                self.active_payload = b.payload
-                return b.payload
-        return None
+        i = self._button_at(pos)
+        if i is None:
+            return None
+        b = self.buttons[i]
+        self.active_payload = b.payload
+        return b.payload
 
 
 
@@ -339,6 +491,7 @@ class World:
         self.FPS = cfg["FPS"]
         self.GRID = cfg["GRID"]
         self.SNAP_RADIUS = cfg["SNAP_RADIUS"]
+        self._snap_r2 = self.SNAP_RADIUS * self.SNAP_RADIUS
         self.PORT_RADIUS = cfg["PORT_RADIUS"]
         self.SIGNAL_FAMILIES = {k: {s: tuple(v2) for s, v2 in v.items()} for k, v in cfg["SIGNAL_FAMILIES"].items()}
         self.DEFAULT_FAMILY = cfg["DEFAULT_FAMILY"]
@@ -354,13 +507,42 @@ class World:
         # World state
         self.blocks: List[Block] = []
         self.wires: List[Wire] = []
+        self._wires_by_block: Dict[Block, List[Wire]] = defaultdict(list)
         self.selected: Optional[Block] = None
         self.drag_offset = (0, 0)
         self.wiring_from: Optional[Port] = None
+        self.wiring_from_target: Optional[Port] = None  # snap target under the cursor, updated on motion
         self.toolbar = Toolbar(self)
         self.tool = "select"
         self.place_spec: Optional[Dict] = None
 
+        # Spatial index: cell -> blocks overlapping it (ports included, they sit on the edges)
+        self._cell_size = max(self.GRID * 4, 64)
+        self._grid: Dict[Tuple[int, int], List[Block]] = defaultdict(list)
+        self._block_cells: Dict[Block, List[Tuple[int, int]]] = {}
+        self._block_z: Dict[Block, int] = {}
+        self._next_z = 0
+
+        # Port positions as flat arrays (SoA) for vectorized snapping; rows [:len(_port_refs)] are live
+        self._port_refs: List[Port] = []
+        self._port_xy = np.zeros((64, 2), dtype=np.int32)
+        self._port_dir = np.zeros(64, dtype=np.uint8)  # 0 = in, 1 = out
+        self._port_state = np.zeros(64, dtype=bool)
+        # Wire endpoints as port-array rows, rebuilt lazily when wires/ports change
+        self._wire_src_idx = np.zeros(0, dtype=np.int32)
+        self._wire_dst_idx = np.zeros(0, dtype=np.int32)
+        self._edges_dirty = False
+        if njit is not None:
+            # numba compiles on first call; do it now rather than on the first wire drag
+            _nearest_port(self._port_xy[:1], self._port_dir[:1], 0, 0, self._snap_r2, -1)
+
+        # Render caches
+        self._grid_surface: Optional[pygame.Surface] = None
+        self._port_sprites: Dict[Tuple[int, int, int], pygame.Surface] = {}
+        # Redraw tracking: dirty with no rects means the whole screen
+        self._dirty = True
+        self._dirty_rects: List[pygame.Rect] = []
+
     # Block factory
     def create_block(self, kind: str, pos: Tuple[int, int], **kw) -> Block:
         if kind == "input":
@@ -378,16 +560,126 @@ class World:
         else:
             raise ValueError("Unknown block type")
         self.blocks.append(b)
+        self._block_z[b] = self._next_z
+        self._next_z += 1
+        self._index_block(b)
         return b
 
     def remove_block(self, b: Block):
-        self.wires = [w for w in self.wires if (w.src.owner is not b and w.dst.owner is not b)]
+        for w in self._wires_by_block.pop(b, ()):
+            self.wires.remove(w)
+            for owner in (w.src.owner, w.dst.owner):
+                if owner is not b:
+                    self._wires_by_block[owner].remove(w)
+        if self.wiring_from is not None and self.wiring_from.owner is b:
+            self.wiring_from = None
+            self.wiring_from_target = None
+        elif self.wiring_from_target is not None and self.wiring_from_target.owner is b:
+            self.wiring_from_target = None
+        self._unindex_block(b)
+        del self._block_z[b]
         self.blocks.remove(b)
+        for p in b.ports:
+            p._idx = -1  # its row is reused by live ports after the rebuild
+        self._rebuild_ports()
         if self.selected is b:
             self.selected = None
 
+    # Spatial index
+    def _cells_in(self, left, top, right, bottom):
+        cs = self._cell_size
+        for cx in range(left // cs, right // cs + 1):
+            for cy in range(top // cs, bottom // cs + 1):
+                yield (cx, cy)
+
+    def _unindex_block(self, b: Block):
+        for cell in self._block_cells.pop(b, ()):
+            bucket = self._grid[cell]
+            bucket.remove(b)
+            if not bucket:
+                del self._grid[cell]
+
+    def _index_block(self, b: Block):
+        if b not in self._block_z:
+            return  # not yet registered by create_block
+        self._unindex_block(b)
+        r = b.rect()
+        cells = list(self._cells_in(r.left, r.top, r.right, r.bottom))
+        for cell in cells:
+            self._grid[cell].append(b)
+        self._block_cells[b] = cells
+
+    # Port arrays
+    def _register_port(self, p: Port):
+        n = len(self._port_refs)
+        if n == len(self._port_dir):
+            self._port_xy = np.concatenate([self._port_xy, np.zeros_like(self._port_xy)])
+            self._port_dir = np.concatenate([self._port_dir, np.zeros_like(self._port_dir)])
+            self._port_state = np.concatenate([self._port_state, np.zeros_like(self._port_state)])
+        p._idx = n
+        self._port_refs.append(p)
+        self._port_xy[n] = p._world
+        self._port_dir[n] = 1 if p.direction == "out" else 0
+        self._port_state[n] = False
+
+    def _sync_ports(self, b: Block):
+        for p in b.ports:
+            self._port_xy[p._idx] = p._world
+
+    def _rebuild_ports(self):
+        states = [(p, bool(self._port_state[p._idx])) for b in self.blocks for p in b.ports]
+        self._port_refs = []
+        for p, state in states:
+            self._register_port(p)
+            self._port_state[p._idx] = state
+        self._edges_dirty = True
+
+    def _add_wire(self, w: Wire):
+        self.wires.append(w)
+        self._wires_by_block[w.src.owner].append(w)
+        if w.dst.owner is not w.src.owner:
+            self._wires_by_block[w.dst.owner].append(w)
+        self._edges_dirty = True
+
+    # Redraw tracking
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self, *rects: pygame.Rect):
+        if not rects:
+            self._dirty_rects = []
+        elif not self._dirty or self._dirty_rects:
+            self._dirty_rects.extend(rects)
+        self._dirty = True
+
+    def take_dirty(self) -> Optional[List[pygame.Rect]]:
+        """Returns None when clean, [] for a full repaint, else the rects to update."""
+        if not self._dirty:
+            return None
+        rects = self._dirty_rects
+        self._dirty = False
+        self._dirty_rects = []
+        if not rects:
+            return []
+        # one merged rect beats many small overlapping updates
+        screen = pygame.Rect(0, 0, self.WIDTH, self.HEIGHT)
+        return [rects[0].unionall(rects[1:]).clip(screen)]
+
+    def _block_area(self, b: Block) -> pygame.Rect:
+        # block incl. selection outline and port discs, plus its attached wires
+        pad = 2 * (self.PORT_RADIUS + 4)
+        area = b.rect().inflate(pad, pad)
+        area.union_ip(pygame.Rect(b.rect().topleft, b._body().get_size()))  # label overhang
+        for w in self._wires_by_block.get(b, ()):
+            (sx, sy), (dx, dy) = w.src._world, w.dst._world
+            wr = pygame.Rect(min(sx, dx), min(sy, dy), abs(dx - sx) + 1, abs(dy - sy) + 1)
+            area.union_ip(wr.inflate(pad, pad))
+        return area
+
     # Interaction
     def on_mouse_down(self, pos, button):
+        self.mark_dirty()
         # 1) Toolbar interaction
         if self.toolbar.rect.collidepoint(*pos):
             payload = self.toolbar.handle_click(pos)
@@ -414,6 +706,7 @@ class World:
             if port:
                 # Start wiring from any port (input or output)
                 self.wiring_from = port
+                self.wiring_from_target = None
                 # Do not change selection while wiring
                 return
             # Select for dragging
@@ -432,51 +725,67 @@ class World:
 
     def on_mouse_up(self, pos, button):
         if self.wiring_from:
+            self.mark_dirty()
             expected = "in" if self.wiring_from.direction == "out" else "out"
             target_port = self.find_near_port(*pos, expect_direction=expected)
             if target_port and target_port is not self.wiring_from:
                 if self.wiring_from.direction == "out":
-                    self.wires.append(Wire(self.wiring_from, target_port))
+                    self._add_wire(Wire(self.wiring_from, target_port))
                 else:
-                    self.wires.append(Wire(target_port, self.wiring_from))
+                    self._add_wire(Wire(target_port, self.wiring_from))
                 self.propagate_demo()
             self.wiring_from = None
+            self.wiring_from_target = None
 
     def on_mouse_motion(self, pos, rel, buttons):
+        if self.wiring_from:
+            # rubber band follows the cursor
+            expected = "in" if self.wiring_from.direction == "out" else "out"
+            self.wiring_from_target = self.find_near_port(*pos, expect_direction=expected)
+            self.mark_dirty()
         if self.selected and buttons[0]:
+            before = self._block_area(self.selected)
             new_x = pos[0] - self.drag_offset[0] + self.selected.w // 2
             new_y = pos[1] - self.drag_offset[1] + self.selected.h // 2
             self.selected.move_to(new_x, new_y)
+            self.mark_dirty(before, self._block_area(self.selected))
+        if self.toolbar.update_hover(pos):
+            self.mark_dirty(self.toolbar.rect)
 
     def on_key_down(self, key):
+        self.mark_dirty()
         if key in (pygame.K_DELETE, pygame.K_BACKSPACE) and self.selected:
             self.remove_block(self.selected)
 
     # Queries
     def find_block_at(self, mx, my) -> Optional[Block]:
-        for b in reversed(self.blocks):
-            if b.hit(mx, my):
-                return b
-        return None
-
-    def find_near_port(self, mx, my, expect_direction: Optional[str] = None) -> Optional[Port]:
+        # topmost (most recently created) block wins, as in draw order
         best = None
-        best_d2 = self.SNAP_RADIUS ** 2
-        for b in self.blocks:
-            for p in b.ports:
-                if expect_direction and p.direction != expect_direction:
-                    continue
-                x, y = p.world()
-                d2 = (mx - x) ** 2 + (my - y) ** 2
-                if d2 <= best_d2:
-                    best = p
-                    best_d2 = d2
+        for b in self._grid.get((mx // self._cell_size, my // self._cell_size), ()):
+            if b.hit(mx, my) and (best is None or self._block_z[b] > self._block_z[best]):
+                best = b
         return best
 
+    def find_near_port(self, mx, my, expect_direction: Optional[str] = None) -> Optional[Port]:
+        n = len(self._port_refs)
+        if not n:
+            return None
+        want = -1
+        if expect_direction:
+            want = 1 if expect_direction == "out" else 0
+        i = _nearest_port(self._port_xy[:n], self._port_dir[:n], mx, my, self._snap_r2, want)
+        return self._port_refs[i] if i >= 0 else None
+
     # Demo signal propagation
     def propagate_demo(self):
-        for w in self.wires:
-            w.dst.state = w.src.state
+        if self._edges_dirty:
+            self._wire_src_idx = np.fromiter((w.src._idx for w in self.wires), dtype=np.int32, count=len(self.wires))
+            self._wire_dst_idx = np.fromiter((w.dst._idx for w in self.wires), dtype=np.int32, count=len(self.wires))
+            self._edges_dirty = False
+        # wires always run out -> in, so no source is also a destination and
+        # one gather/scatter matches the old sequential copy
+        self._port_state[self._wire_dst_idx] = self._port_state[self._wire_src_idx]
+        self.mark_dirty()
 
     # Rendering
     def draw_grid(self, surface):
@@ -485,34 +794,74 @@ class World:
         for y in range(0, self.toolbar.rect.y, self.GRID):
             pygame.draw.line(surface, (26, 28, 32), (0, y), (self.WIDTH, y))
 
-    def draw(self, surface):
-        surface.fill(self.BLACK)
-        self.draw_grid(surface)
+    def _background(self, surface) -> pygame.Surface:
+        # grid is static: rasterize once, rebuild only if the target size changes
+        size = surface.get_size()
+        if self._grid_surface is None or self._grid_surface.get_size() != size:
+            bg = pygame.Surface(size).convert()
+            bg.fill(self.BLACK)
+            self.draw_grid(bg)
+            self._grid_surface = bg
+        return self._grid_surface
+
+    def _draw_wires(self, surface):
+        # wire end caps are not drawn, the port discs drawn later cover them
+        fam, default = self.SIGNAL_FAMILIES, self.DEFAULT_FAMILY
+        draw_lines = pygame.draw.lines
         for w in self.wires:
-            w.draw(surface, self.SIGNAL_FAMILIES, self.DEFAULT_FAMILY, self.PORT_RADIUS)
+            draw_lines(surface, w.color(fam, default), False, w.points(), 4)
+
+    def _port_sprite(self, col) -> pygame.Surface:
+        # outline + fill disc rasterized once per color
+        sprite = self._port_sprites.get(col)
+        if sprite is None:
+            r = self.PORT_RADIUS + 2
+            sprite = pygame.Surface((2 * r + 1, 2 * r + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (0, 0, 0), (r, r), r)
+            pygame.draw.circle(sprite, col, (r, r), self.PORT_RADIUS)
+            sprite = self._port_sprites[col] = sprite.convert_alpha()
+        return sprite
+
+    def _draw_all_ports(self, surface):
+        # one blits() call for every port disc
+        off = self.PORT_RADIUS + 2
+        fam = self.SIGNAL_FAMILIES
+        batch = []
+        for b in self.blocks:
+            for p in b.ports:
+                x, y = p._world
+                batch.append((self._port_sprite(p.color(fam)), (x - off, y - off)))
+        surface.blits(batch, doreturn=False)
+
+    def draw(self, surface):
+        surface.blit(self._background(surface), (0, 0))
+        self._draw_wires(surface)
         if self.wiring_from:
             mx, my = pygame.mouse.get_pos()
-            expected = "in" if self.wiring_from.direction == "out" else "out"
-            target = self.find_near_port(mx, my, expect_direction=expected)
+            target = self.wiring_from_target
             if target:
-                mx, my = target.world()
-            sx, sy = self.wiring_from.world()
+                mx, my = target._world
+            sx, sy = self.wiring_from._world
             midx = (sx + mx) // 2
             points = [(sx, sy), (midx, sy), (midx, my), (mx, my)]
             pal = self.SIGNAL_FAMILIES[self.wiring_from.family]
             col = pal["on"] if self.wiring_from.state else pal["off"]
             pygame.draw.lines(surface, col, False, points, self.WIRE_WIDTH)  # 두께 적용
             if target:
-                pygame.draw.circle(surface, self.SELECT, target.world(), self.PORT_RADIUS + 3, 2)
+                pygame.draw.circle(surface, self.SELECT, target._world, self.PORT_RADIUS + 3, 2)
 
         for b in self.blocks:
             b.draw(surface)
+        self._draw_all_ports(surface)
         self.toolbar.draw(surface)
 
 
 
 def run(config_path: str = "config.txt") -> None:
     cfg = _load_config(config_path)
+    # let SDL coalesce primitive draws where a hardware renderer is in use
+    # (hints must be set before init; user env wins)
+    os.environ.setdefault("SDL_RENDER_BATCHING", "1")
     pygame.init()
     pygame.display.set_caption("SchemBoard — GUI Prototype")
     screen = pygame.display.set_mode((cfg["WIDTH"], cfg["HEIGHT"]))
@@ -522,10 +871,17 @@ def run(config_path: str = "config.txt") -> None:
 
     running = True
     while running:
-        clock.tick(cfg["FPS"])
-        for event in pygame.event.get():
+        if world.dirty:
+            events = pygame.event.get()
+        else:
+            # nothing animates: sleep until input arrives instead of spinning
+            events = [pygame.event.wait()]
+            events.extend(pygame.event.get())
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.WINDOWEXPOSED:
+                world.mark_dirty()
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
                 world.on_mouse_down(event.pos, event.button)
             elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
@@ -537,10 +893,19 @@ def run(config_path: str = "config.txt") -> None:
                     world.tool = "select"
                     world.place_spec = None
                     world.toolbar.active_payload = {"tool": "select"}
+                    world.mark_dirty()
                 else:
                     world.on_key_down(event.key)
 
+        rects = world.take_dirty()
+        if rects is None:
+            continue
         world.draw(screen)
-        pygame.display.flip()
+        if rects:
+            pygame.display.update(rects)
+        else:
+            pygame.display.flip()
+        clock.tick(cfg["FPS"])  # caps redraw rate only; idle frames never get here
 
+    _clear_font_caches()
     pygame.quit()